@@ -1,9 +1,14 @@
 import argparse
+import errno
 import logging
+import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+LARGE_FILE_SIZE = 1024 * 1024  # файли від 1 МБ копіюються окремим пулом потоків
+
 
 def setup_logging(verbose: bool = False) -> None:
     logging.basicConfig(
@@ -28,51 +33,140 @@ def parse_args() -> argparse.Namespace:
                         help="Створити тестову директорію з файлами і використати її як source_dir")
     parser.add_argument("--print-tree", action="store_true",
                         help="Після завершення вивести дерево директорії призначення")
+    parser.add_argument("--workers", type=int, default=(os.cpu_count() or 1) * 4,
+                        help="Кількість потоків для копіювання/переміщення "
+                             "(за замовчуванням: CPU × 4)")
+    parser.add_argument("--large-workers", type=int, default=4,
+                        help="Кількість потоків для великих файлів (≥ 1 МБ), "
+                             "щоб вони не блокували дрібні (за замовчуванням: 4)")
     return parser.parse_args()
 
 
 def iter_files_recursively(root: Path, skip: Path | None = None):
-    """Рекурсивно обходить усі файли у директорії."""
-    try:
-        for entry in root.iterdir():
-            if skip and entry.resolve() == skip:
-                continue
-            if entry.is_dir() and not entry.is_symlink():
-                yield from iter_files_recursively(entry, skip=skip)
-            elif entry.is_file():
-                yield entry
-    except Exception as e:
-        logging.warning(f"Помилка доступу до {root}: {e}")
+    """
+    Обходить усі файли у директорії (ітеративно, через os.scandir).
+    Повертає os.DirEntry: вони кешують результати stat, тож .is_dir()/.is_file()
+    не роблять повторних системних викликів.
+    """
+    skip_str = os.fspath(skip) if skip else None
+    stack = [os.fspath(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.path == skip_str:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+        except OSError as e:
+            logging.warning(f"Помилка доступу до {current}: {e}")
+
+
+def existing_names(directory: Path) -> set[str]:
+    """
+    Повертає множину імен, які вже є в теці (один os.scandir замість stat на кожне ім’я).
+    Імена зберігаються без урахування регістру (casefold): на Windows/macOS X.TXT і x.txt —
+    той самий файл, і другий перезаписав би перший.
+    """
+    with os.scandir(directory) as it:
+        return {entry.name.casefold() for entry in it}
 
 
-def safe_dest_path(dest_dir: Path, src_file: Path) -> Path:
-    """Формує безпечний шлях (якщо ім’я вже існує — додає _1, _2...)."""
-    ext = src_file.suffix
-    stem = src_file.stem
-    candidate = dest_dir / f"{stem}{ext}"
+def safe_dest_path(dest_dir: Path, src_file: os.DirEntry,
+                   used_names: set[str] | None = None) -> Path:
+    """
+    Формує безпечний шлях (якщо ім’я вже існує — додає _1, _2...).
+    used_names — імена, вже зайняті в dest_dir (див. existing_names); обране ім’я
+    додається до неї, тож наступні файли в цій теці не отримають таку саму назву.
+    """
+    if used_names is None:
+        used_names = existing_names(dest_dir)
+    stem, ext = os.path.splitext(src_file.name)
+    name = f"{stem}{ext}"
     counter = 1
-    while candidate.exists():
-        candidate = dest_dir / f"{stem}_{counter}{ext}"
+    while name.casefold() in used_names:
+        name = f"{stem}_{counter}{ext}"
         counter += 1
-    return candidate
+    used_names.add(name.casefold())
+    return dest_dir / name
 
 
-def place_for(src_file: Path, dest_root: Path) -> Path:
-    """Повертає теку для файлу згідно з його розширенням."""
-    ext = src_file.suffix.lower().lstrip(".")
+def place_for(src_file: os.DirEntry, dest_root: Path,
+              cache: dict[str, Path] | None = None) -> Path:
+    """
+    Повертає теку для файлу згідно з його розширенням.
+    cache (розширення -> тека) дозволяє не створювати новий Path для кожного файлу.
+    """
+    ext = os.path.splitext(src_file.name)[1].lower().lstrip(".")
     subdir = ext if ext else "no_extension"
-    return dest_root / subdir
+    if cache is None:
+        return dest_root / subdir
+    target_dir = cache.get(subdir)
+    if target_dir is None:
+        target_dir = cache[subdir] = dest_root / subdir
+    return target_dir
 
 
-def copy_or_move(src: Path, dst: Path, move: bool) -> None:
-    """Копіює або переміщує файл."""
+def copy_or_move(src: os.DirEntry | Path, dst: Path, move: bool,
+                 same_device: bool = False,
+                 deferred_stat: list[tuple[str, Path]] | None = None) -> None:
+    """
+    Копіює або переміщує файл.
+    Якщо джерело й призначення на одній файловій системі (same_device), переміщення —
+    це лише os.rename без перевірок shutil.move; якщо все ж виявиться, що це інший
+    пристрій (EXDEV, напр. підтека-точка монтування), переходимо на shutil.move.
+    Копіювання йде через shutil.copyfile (швидкий шлях ядра: sendfile/copy_file_range);
+    якщо передано deferred_stat, копіювання метаданих відкладається до copy_stats().
+    """
     try:
-        if move:
+        if move and same_device:
+            try:
+                os.rename(src, dst)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(src, dst)
+        elif move:
             shutil.move(src, dst)
         else:
-            shutil.copy2(src, dst)
+            shutil.copyfile(src, dst)
+            if deferred_stat is None:
+                shutil.copystat(src, dst)
+            else:
+                deferred_stat.append((os.fspath(src), dst))
     except Exception as e:
-        logging.warning(f"Помилка під час операції {src} -> {dst}: {e}")
+        logging.warning(f"Помилка під час операції {os.fspath(src)} -> {dst}: {e}")
+
+
+def copy_stats(pairs: list[tuple[str, Path]]) -> None:
+    """Копіює метадані (час, права) для вже скопійованих файлів одним проходом."""
+    for src, dst in pairs:
+        try:
+            shutil.copystat(src, dst)
+        except Exception as e:
+            logging.warning(f"Помилка копіювання метаданих {src} -> {dst}: {e}")
+
+
+def build_plan(files: list[os.DirEntry],
+               dest_root: Path) -> list[tuple[os.DirEntry, Path]]:
+    """
+    Готує план операцій (src, dst) до початку копіювання:
+    створює всі підтеки одним проходом і резервує імена, щоб у гарячому циклі
+    лишалися тільки самі операції з файлами.
+    """
+    ext_to_dir: dict[str, Path] = {}
+    target_dirs = [place_for(file_path, dest_root, ext_to_dir) for file_path in files]
+    for target_dir in ext_to_dir.values():
+        target_dir.mkdir(parents=True, exist_ok=True)
+
+    used = {target_dir: existing_names(target_dir) for target_dir in ext_to_dir.values()}
+    final_paths = [safe_dest_path(target_dir, file_path, used[target_dir])
+                   for file_path, target_dir in zip(files, target_dirs)]
+
+    return list(zip(files, final_paths))
 
 
 def create_test_directory(base: Path) -> Path:
@@ -102,6 +196,10 @@ def main() -> int:
     args = parse_args()
     setup_logging(args.verbose)
 
+    if args.workers < 1 or args.large_workers < 1:
+        logging.error(f"Кількість потоків має бути ≥ 1: {args.workers}, {args.large_workers}")
+        return 1
+
     # Якщо треба створити тестову теку
     if args.create_test:
         base = Path.cwd()
@@ -119,14 +217,42 @@ def main() -> int:
         return 1
 
     dest.mkdir(parents=True, exist_ok=True)
+    # Один справжній os.stat на кожну теку: DirEntry.stat() на Windows дає st_dev == 0
+    same_fs = source.stat().st_dev == dest.stat().st_dev
+
+    # Етап 1: обхід вихідної теки (лише читання метаданих)
+    files = list(iter_files_recursively(source, skip=dest))
+    # Етап 2: усі підтеки-розширення створюються один раз, імена резервуються
+    plan = build_plan(files, dest)
 
+    # Етап 3: копіювання/переміщення — I/O-операції, тож потоки працюють паралельно
     processed = 0
-    for file_path in iter_files_recursively(source, skip=dest):
-        target_dir = place_for(file_path, dest)
-        target_dir.mkdir(parents=True, exist_ok=True)
-        final_path = safe_dest_path(target_dir, file_path)
-        copy_or_move(file_path, final_path, move=args.move)
-        processed += 1
+    deferred_stat: list[tuple[str, Path]] = []
+
+    def run(task: tuple[os.DirEntry, Path]) -> None:
+        src, dst = task
+        copy_or_move(src, dst, args.move, same_fs, deferred_stat)
+
+    # Великі й дрібні файли — у різних пулах: кілька великих файлів не займають
+    # усі потоки, поки тисячі дрібних чекають у черзі. Розмір беремо з stat за
+    # посиланням: copyfile копіює ціль символьного посилання, а не саме посилання
+    small, large = [], []
+    for task in plan:
+        try:
+            size = task[0].stat().st_size
+        except OSError:
+            size = 0
+        (large if size >= LARGE_FILE_SIZE else small).append(task)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as small_pool, \
+            ThreadPoolExecutor(max_workers=args.large_workers) as large_pool:
+        small_results = small_pool.map(run, small)
+        large_results = large_pool.map(run, large)
+        for _ in small_results:
+            processed += 1
+        for _ in large_results:
+            processed += 1
+    copy_stats(deferred_stat)
 
     logging.info(f"Готово. Опрацьовано файлів: {processed}")
 
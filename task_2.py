@@ -1,40 +1,92 @@
 
 """
-Сніжинка Коха з рекурсією.
+Сніжинка Коха: правило F -> F+F--F+F розгортається ітеративно як L-система.
+За --speed 0 уся ламана рахується заздалегідь і малюється одним Canvas.create_line;
+за --speed > 0 — анімовано через turtle.
 Користування:
     python koch_snowflake.py --level 4 --size 300 --speed 0
 """
 
 import argparse
+import math
 import sys
 import turtle
 
 
-def koch_segment(t: turtle.Turtle, length: float, level: int) -> None:
-    """Рекурсивно малює один відрізок кривої Коха."""
-    if level == 0:
-        t.forward(length)
-        return
-    length /= 3.0
-    koch_segment(t, length, level - 1)
-    t.left(60)
-    koch_segment(t, length, level - 1)
-    t.right(120)
-    koch_segment(t, length, level - 1)
-    t.left(60)
-    koch_segment(t, length, level - 1)
+def koch_commands(level: int) -> str:
+    """
+    Розгортає L-систему кривої Коха (F -> F+F--F+F) на level кроків.
+    F — крок уперед, + — поворот ліворуч на 60°, - — праворуч на 60°.
+    """
+    seq = "F"
+    for _ in range(level):
+        seq = seq.replace("F", "F+F--F+F")
+    return seq
+
+
+def koch_segment(t: turtle.Turtle, length: float, level: int,
+                 commands: str | None = None) -> None:
+    """
+    Малює один відрізок кривої Коха за розгорнутою L-системою (без рекурсії).
+    commands — уже розгорнутий рядок koch_commands(level), щоб не будувати його повторно.
+    """
+    step = length / (3 ** level)
+    if commands is None:
+        commands = koch_commands(level)
+    for c in commands:
+        if c == "F":
+            t.forward(step)
+        elif c == "+":
+            t.left(60)
+        else:
+            t.right(60)
 
 
 def koch_snowflake(t: turtle.Turtle, length: float, level: int) -> None:
     """Малює сніжинку Коха (3 сторони)."""
+    commands = koch_commands(level)
     for _ in range(3):
-        koch_segment(t, length, level)
+        koch_segment(t, length, level, commands)
         t.right(120)
 
 
+def koch_points(length: float, level: int,
+                x0: float = 0.0, y0: float = 0.0) -> list[tuple[float, float]]:
+    """
+    Обчислює вершини сніжинки Коха як одну ламану (без turtle).
+    Напрямок кодуємо номером 0..5 (кратні 60°), тож зміщення беруться з таблиці.
+    """
+    step = length / (3 ** level)
+    moves = [(step * math.cos(math.radians(60 * k)), step * math.sin(math.radians(60 * k)))
+             for k in range(6)]
+    side = koch_commands(level)
+    x, y, heading = x0, y0, 0
+    points = [(x, y)]
+    for _ in range(3):
+        for c in side:
+            if c == "F":
+                dx, dy = moves[heading]
+                x += dx
+                y += dy
+                points.append((x, y))
+            elif c == "+":
+                heading = (heading + 1) % 6
+            else:
+                heading = (heading - 1) % 6
+        heading = (heading - 2) % 6  # t.right(120) між сторонами
+    return points
+
+
+def draw_on_canvas(screen: turtle.TurtleScreen, points: list[tuple[float, float]],
+                   color: str, width: int = 2) -> None:
+    """Малює ламану одним викликом Canvas.create_line (вісь y у Tk спрямована вниз)."""
+    flat = [coord for x, y in points for coord in (x, -y)]
+    screen.getcanvas().create_line(*flat, fill=color, width=width)
+
+
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(
-        description="Рекурсивна сніжинка Коха (turtle)."
+        description="Сніжинка Коха (L-система; Canvas за --speed 0, turtle інакше)."
     )
     p.add_argument("--level", "-l", type=int, default=3,
                    help="Рівень рекурсії (0..8 рекомендовано). За замовчуванням: 3")
@@ -63,6 +115,9 @@ def main() -> int:
     screen = turtle.Screen()
     screen.title(f"Koch Snowflake — level {args.level}")
     screen.bgcolor(args.bg)
+    if args.speed == 0:
+        # Без анімації: вимикаємо перемальовування на кожен крок, оновимо екран один раз
+        screen.tracer(0, 0)
 
     t = turtle.Turtle(visible=False)
     t.speed(args.speed)
@@ -76,10 +131,14 @@ def main() -> int:
     t.goto(-args.size / 2.0, -height / 3.0)  # трошки нижче центру для гарного вміщення
     t.pendown()
 
-    koch_snowflake(t, args.size, args.level)
+    if args.speed == 0:
+        # Без анімації: усі точки рахуємо заздалегідь і віддаємо Tk одним викликом
+        draw_on_canvas(screen, koch_points(args.size, args.level, *t.position()), args.color)
+    else:
+        koch_snowflake(t, args.size, args.level)
+    screen.update()
 
     # Залишаємо вікно відкритим до кліку
-    t.hideturtle()
     turtle.done()
     return 0
 